@@ -0,0 +1,15 @@
+"""Comandos de desenvolvimento: dados sintéticos, benchmark, teste de carga e verificações.
+
+Ficam fora de app.py para não pesar no import dos workers do gunicorn;
+create_app() só registra estes comandos quando roda pelo `flask`.
+"""
+
+
+def registrar_comandos(app):
+    from ferramentas import benchmark, carga, emails, planos
+
+    app.cli.add_command(benchmark.seed_command)
+    app.cli.add_command(benchmark.benchmark_command)
+    app.cli.add_command(carga.teste_carga_command)
+    app.cli.add_command(emails.verificar_emails_command)
+    app.cli.add_command(planos.verificar_planos_command)
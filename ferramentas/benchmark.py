@@ -0,0 +1,325 @@
+"""Dados sintéticos (`flask seed`) e benchmark das rotas pesadas (`flask benchmark`).
+
+`flask seed` enche um banco vazio com volumes de produção (alunos entrando
+e saindo ao longo dos anos, mensalidades, chamadas, contas); `flask
+benchmark` cronometra as rotas pesadas e compara com benchmarks/*.json.
+"""
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func
+
+from app import (app, db, User, Turma, Matricula, HistoricoMatricula, Mensalidade, Presenca, ContasPagar,
+                 EmailSaida, ExecucaoJob, aluno_turma, gerar_hash_senha, reconstruir_resumo_financeiro,
+                 criar_indice_busca)
+
+NOMES_SINTETICOS = ['Ana', 'Beatriz', 'Carla', 'Daniela', 'Eduarda', 'Fernanda', 'Gabriela', 'Helena', 'Isabela',
+                    'Juliana', 'Larissa', 'Mariana', 'Natália', 'Patrícia', 'Renata', 'Sofia', 'Tatiana', 'Vitória',
+                    'André', 'Bruno', 'Carlos', 'Diego', 'Felipe', 'Gustavo', 'Henrique', 'João', 'Lucas', 'Marcelo',
+                    'Pedro', 'Rafael', 'Thiago']
+SOBRENOMES_SINTETICOS = ['Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Ferreira', 'Costa', 'Rodrigues',
+                         'Almeida', 'Nascimento', 'Araújo', 'Melo', 'Barbosa', 'Cavalcanti', 'Gomes', 'Lins', 'Carvalho']
+CIDADES_SINTETICAS = ['Recife', 'Olinda', 'Jaboatão dos Guararapes', 'Paulista', 'Camaragibe', 'Cabo de Santo Agostinho']
+MODALIDADES_SINTETICAS = ['Hatha Yoga', 'Vinyasa Yoga', 'Ashtanga Yoga', 'Yoga Terapêutico', 'Pilates Solo', 'Meditação']
+DIAS_SEMANA_NOMES = ['Seg', 'Ter', 'Qua', 'Qui', 'Sex', 'Sáb']
+SENHA_DADOS_SINTETICOS = 'senha123'
+LOTE_SEED = 5000
+
+class _InsercaoEmLote:
+    """Acumula linhas por tabela e grava em executemany de LOTE_SEED linhas."""
+    def __init__(self, conn):
+        self.conn = conn
+        self.pendentes = defaultdict(list)
+        self.totais = defaultdict(int)
+
+    def adicionar(self, tabela, linha):
+        linhas = self.pendentes[tabela]
+        linhas.append(linha)
+        if len(linhas) >= LOTE_SEED:
+            self.gravar(tabela)
+
+    def gravar(self, tabela):
+        linhas = self.pendentes.pop(tabela, None)
+        if linhas:
+            self.conn.execute(tabela.insert(), linhas)
+            self.totais[tabela.name] += len(linhas)
+
+    def gravar_tudo(self):
+        for tabela in list(self.pendentes):
+            self.gravar(tabela)
+
+def _datas_aula(mes, dias_semana, ate):
+    fim = _mes_seguinte_data(mes)
+    dia = mes
+    while dia < fim and dia <= ate:
+        if dia.weekday() in dias_semana:
+            yield dia
+        dia += timedelta(days=1)
+
+def _mes_seguinte_data(mes):
+    return date(mes.year + mes.month // 12, mes.month % 12 + 1, 1)
+
+def gerar_dados_sinteticos(alunos, turmas, anos, professores=None, semente=42):
+    """Preenche um banco vazio; devolve {tabela: linhas inseridas}.
+
+    Cada aluno entra num mês aleatório dos últimos `anos`, fica em média
+    14 meses (alguns até hoje) em uma ou duas turmas, paga quase sempre e
+    tem chamada em todas as aulas da turma enquanto matriculado.
+    """
+    rnd = random.Random(semente)
+    hoje = datetime.now().date()
+    meses = [date(hoje.year, hoje.month, 1)]
+    while len(meses) < anos * 12:
+        anterior = meses[0] - timedelta(days=1)
+        meses.insert(0, anterior.replace(day=1))
+    ultimo = len(meses) - 1
+    professores = professores or max(turmas // 10, 3)
+    senha = gerar_hash_senha(SENHA_DADOS_SINTETICOS)
+
+    conn = db.session.connection()
+    lote = _InsercaoEmLote(conn)
+    colunas_usuario = [c.name for c in User.__table__.columns]
+
+    def usuario(**campos):
+        # executemany exige as mesmas colunas em todas as linhas
+        linha = dict.fromkeys(colunas_usuario)
+        linha.update(password=senha, is_approved=True, is_admin=False, precisa_mudar_senha=False)
+        linha.update(campos)
+        return linha
+
+    lote.adicionar(User.__table__, usuario(id=1, username='Administrador', email='admin@exemplo.com',
+                                           role='professor', is_admin=True))
+    ids_professores = list(range(2, professores + 2))
+    for id_professor in ids_professores:
+        lote.adicionar(User.__table__, usuario(
+            id=id_professor, username=f'Prof. {rnd.choice(NOMES_SINTETICOS)} {rnd.choice(SOBRENOMES_SINTETICOS)} {id_professor}',
+            email=f'professor{id_professor}@exemplo.com', role='professor'))
+    primeiro_aluno = professores + 2
+    for id_aluno in range(primeiro_aluno, primeiro_aluno + alunos):
+        nome = f'{rnd.choice(NOMES_SINTETICOS)} {rnd.choice(SOBRENOMES_SINTETICOS)} {rnd.choice(SOBRENOMES_SINTETICOS)}'
+        lote.adicionar(User.__table__, usuario(
+            id=id_aluno, username=f'{nome} {id_aluno}', email=f'aluno{id_aluno}@exemplo.com', role='aluno',
+            cidade=rnd.choice(CIDADES_SINTETICAS), estado='PE', contato_1=f'819{rnd.randrange(10**8):08d}',
+            data_nascimento=date(rnd.randint(1950, 2005), rnd.randint(1, 12), rnd.randint(1, 28)),
+            sexo=rnd.choice(['Feminino', 'Feminino', 'Masculino'])))
+    lote.gravar_tudo()
+
+    dados_turmas = []
+    for id_turma in range(1, turmas + 1):
+        dias = sorted(rnd.sample(range(6), 2))
+        hora = rnd.choice([6, 7, 8, 9, 17, 18, 19, 20])
+        nome = f'{rnd.choice(MODALIDADES_SINTETICAS)} {"/".join(DIAS_SEMANA_NOMES[d] for d in dias)} {hora}h #{id_turma}'
+        professor_id = ids_professores[id_turma % len(ids_professores)]
+        lote.adicionar(Turma.__table__, {'id': id_turma, 'nome': nome, 'professor_id': professor_id, 'ativa': True})
+        dados_turmas.append({'id': id_turma, 'professor_id': professor_id, 'dias': set(dias),
+                             'valor': float(rnd.randrange(90, 260, 10))})
+    lote.gravar_tudo()
+
+    faturadas_por_mes = defaultdict(int)
+    datas_por_turma_mes = {}
+    for id_aluno in range(primeiro_aluno, primeiro_aluno + alunos):
+        inicio = rnd.randrange(len(meses))
+        fim = inicio + int(rnd.expovariate(1 / 14))
+        ativo = fim >= ultimo
+        fim = min(fim, ultimo)
+        assiduidade = rnd.uniform(0.5, 0.95)
+        for turma in rnd.sample(dados_turmas, 2 if rnd.random() < 0.15 else 1):
+            data_matricula = meses[inicio] + timedelta(days=rnd.randrange(28))
+            lote.adicionar(HistoricoMatricula.__table__, {
+                'aluno_id': id_aluno, 'turma_id': turma['id'], 'acao': 'Matrícula',
+                'data_acao': datetime.combine(data_matricula, datetime.min.time())})
+            if ativo:
+                lote.adicionar(Matricula.__table__, {
+                    'user_id': id_aluno, 'turma_id': turma['id'], 'data_vencimento': rnd.choice([5, 10, 15, 20]),
+                    'data_matricula': datetime.combine(data_matricula, datetime.min.time())})
+                lote.adicionar(aluno_turma, {'aluno_id': id_aluno, 'turma_id': turma['id']})
+            else:
+                lote.adicionar(HistoricoMatricula.__table__, {
+                    'aluno_id': id_aluno, 'turma_id': turma['id'], 'acao': 'Desmatrícula',
+                    'data_acao': datetime.combine(_mes_seguinte_data(meses[fim]) - timedelta(days=1), datetime.min.time())})
+
+            for indice in range(inicio, fim + 1):
+                mes = meses[indice]
+                chance_pago = 0.4 if indice == ultimo else 0.85 if indice == ultimo - 1 else 0.97
+                lote.adicionar(Mensalidade.__table__, {
+                    'aluno_id': id_aluno, 'turma_id': turma['id'], 'professor_id': turma['professor_id'],
+                    'mes': mes.strftime('%Y-%m'), 'competencia': mes, 'valor': turma['valor'],
+                    'status': 'Pago' if rnd.random() < chance_pago else 'Pendente', 'data_matricula': data_matricula})
+                faturadas_por_mes[mes] += 1
+
+                chave = (turma['id'], indice)
+                if chave not in datas_por_turma_mes:
+                    datas_por_turma_mes[chave] = list(_datas_aula(mes, turma['dias'], hoje))
+                for data_aula in datas_por_turma_mes[chave]:
+                    lote.adicionar(Presenca.__table__, {
+                        'user_id': id_aluno, 'turma_id': turma['id'], 'data_aula': data_aula,
+                        'presente': rnd.random() < assiduidade})
+
+        if rnd.random() < 0.02:
+            lote.adicionar(EmailSaida.__table__, {
+                'destinatarios': f'aluno{id_aluno}@exemplo.com', 'assunto': 'Recuperação de Senha - Céu de Gaia',
+                'corpo': 'Link de recuperação (dado sintético).', 'status': 'enviado', 'tentativas': 1,
+                'proxima_tentativa_em': datetime.utcnow(), 'criado_em': datetime.utcnow(),
+                'enviado_em': datetime.utcnow()})
+
+    for mes in meses:
+        for _ in range(rnd.randint(6, 10)):
+            vencimento = mes + timedelta(days=rnd.randrange(28))
+            lote.adicionar(ContasPagar.__table__, {
+                'descricao': rnd.choice(['Aluguel', 'Energia', 'Água', 'Internet', 'Limpeza', 'Material', 'Contador']),
+                'valor': float(rnd.randrange(80, 4000)), 'vencimento': vencimento,
+                'status': 'Pago' if vencimento < hoje and rnd.random() < 0.95 else 'Pendente'})
+        if mes < meses[-1] or faturadas_por_mes[mes]:
+            lote.adicionar(ExecucaoJob.__table__, {
+                'nome': 'faturamento_mensal', 'referencia': mes.strftime('%Y-%m'), 'status': 'concluido',
+                'checkpoint': primeiro_aluno + alunos - 1, 'processados': faturadas_por_mes[mes],
+                'iniciado_em': datetime.combine(mes, datetime.min.time()),
+                'atualizado_em': datetime.combine(mes, datetime.min.time()),
+                'concluido_em': datetime.combine(mes, datetime.min.time())})
+    lote.gravar_tudo()
+    db.session.commit()
+
+    reconstruir_resumo_financeiro()
+    criar_indice_busca()
+    return dict(lote.totais)
+
+@click.command('seed')
+@click.option('--students', 'alunos', default=20000, show_default=True, help='Quantidade de alunos.')
+@click.option('--turmas', default=300, show_default=True, help='Quantidade de turmas.')
+@click.option('--years', 'anos', default=5, show_default=True, help='Anos de histórico.')
+@click.option('--professores', default=None, type=int, help='Padrão: uma a cada 10 turmas (mínimo 3).')
+@click.option('--semente', default=42, show_default=True, help='Semente do gerador (mesmos dados a cada execução).')
+@with_appcontext
+def seed_command(alunos, turmas, anos, professores, semente):
+    """Cria tabelas e enche um banco VAZIO com dados sintéticos em escala de produção."""
+    db.create_all()
+    if User.query.first():
+        raise click.ClickException('O banco já tem usuários: use um banco vazio (ex.: DATABASE_URL=sqlite:///seed.db).')
+    inicio = time.perf_counter()
+    totais = gerar_dados_sinteticos(alunos, turmas, anos, professores, semente)
+    for tabela, quantidade in sorted(totais.items()):
+        click.echo(f'{tabela:<22} {quantidade:>10}')
+    click.echo(f'Concluído em {time.perf_counter() - inicio:.0f}s. Login: admin@exemplo.com / {SENHA_DADOS_SINTETICOS}')
+
+PASTA_BENCHMARKS = 'benchmarks'
+# Diferenças abaixo disso são ruído, mesmo que passem da tolerância relativa
+BENCHMARK_RUIDO_MS = 5
+
+def _calibrar_maquina(repeticoes=5):
+    """Mediana (ms) de uma carga fixa de CPU, para descontar a velocidade da máquina."""
+    import statistics
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        sum(len(str(i * i)) for i in range(300000))
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return round(statistics.median(tempos), 1)
+
+def _contagem_dados():
+    return {
+        'alunos': User.query.filter_by(role='aluno').count(),
+        'turmas': Turma.query.count(),
+        'matriculas': Matricula.query.count(),
+        'mensalidades': Mensalidade.query.count(),
+        'presencas': Presenca.query.count(),
+    }
+
+def _rotas_benchmark():
+    """(nome, usuário, método, url, dados) das rotas medidas, nos dados do banco atual."""
+    admin = User.query.filter_by(is_admin=True).first()
+    turma_id, _ = db.session.query(Matricula.turma_id, func.count()).group_by(Matricula.turma_id) \
+        .order_by(func.count().desc()).first()
+    turma = db.session.get(Turma, turma_id)
+    alunos_turma = [m.user_id for m in Matricula.query.filter_by(turma_id=turma_id)]
+    alunos_lote = [u.id for u in User.query.filter_by(role='aluno').order_by(User.id).limit(200)]
+    hoje = datetime.now().date()
+    mes = hoje.strftime('%Y-%m')
+    proximo_mes = _mes_seguinte_data(hoje.replace(day=1)).strftime('%Y-%m')
+    return [
+        ('admin_dashboard', admin.id, 'GET', '/admin_dashboard', None),
+        ('admin_dashboard_filtrado', admin.id, 'GET', f'/admin_dashboard?status=Pendente&mes={mes}', None),
+        ('relatorio_financeiro_professor', admin.id, 'GET', '/relatorio_financeiro_professor', None),
+        ('relatorio_financeiro_professor_mes', admin.id, 'GET', f'/relatorio_financeiro_professor?mes={mes}', None),
+        ('relatorio_alunos_professor', admin.id, 'GET', f'/relatorio_financeiro_professor/{turma.professor_id}/alunos', None),
+        ('get_alunos_turma', turma.professor_id, 'GET', f'/get_alunos_turma/{turma_id}', None),
+        ('salvar_chamada', turma.professor_id, 'POST', f'/salvar_chamada/{turma_id}',
+         {'datas': [hoje.isoformat()], 'alunos_presenca': [str(a) for a in alunos_turma[::2]]}),
+        # dry_run: mede a seleção do lote sem alterar o banco entre as rodadas
+        ('gerar_mensalidades_lote', admin.id, 'POST', '/gerar_mensalidades_lote',
+         {'alunos_ids': [str(a) for a in alunos_lote], 'mes_referencia': proximo_mes, 'valor': '150', 'dry_run': '1'}),
+    ]
+
+@click.command('benchmark')
+@click.option('--rodadas', default=7, show_default=True, help='Medições por rota (mais uma de aquecimento).')
+@click.option('--salvar', is_flag=True, help='Grava os resultados como nova linha de base.')
+@click.option('--tolerancia', default=0.25, show_default=True, help='Piora relativa aceita sobre a linha de base.')
+@click.option('--arquivo', default=None, help='Linha de base (padrão: benchmarks/baseline_<banco>.json).')
+@with_appcontext
+def benchmark_command(rodadas, salvar, tolerancia, arquivo):
+    """Cronometra as rotas pesadas e compara com a linha de base gravada."""
+    import statistics
+    arquivo = arquivo or os.path.join(app.root_path, PASTA_BENCHMARKS, f'baseline_{db.engine.dialect.name}.json')
+    dados = _contagem_dados()
+    if not dados['matriculas']:
+        raise click.ClickException('Banco sem matrículas: rode `flask seed` antes.')
+
+    calibracao = _calibrar_maquina()
+    cliente = app.test_client()
+    resultados = {}
+    for nome, usuario_id, metodo, url, formulario in _rotas_benchmark():
+        with cliente.session_transaction() as sessao:
+            sessao['_user_id'] = str(usuario_id)
+            sessao['_fresh'] = True
+        tempos = []
+        for rodada in range(rodadas + 1):
+            inicio = time.perf_counter()
+            # Contexto novo por request (ver verificar-planos)
+            with app.app_context():
+                resposta = cliente.open(url, method=metodo, data=formulario)
+                resposta.get_data()
+            if resposta.status_code >= 400:
+                raise click.ClickException(f'{nome}: HTTP {resposta.status_code}')
+            if rodada:
+                tempos.append((time.perf_counter() - inicio) * 1000)
+        resultados[nome] = {'mediana_ms': round(statistics.median(tempos), 1), 'max_ms': round(max(tempos), 1)}
+
+    base = {}
+    if os.path.exists(arquivo):
+        with open(arquivo, encoding='utf-8') as f:
+            base = json.load(f)
+        diferentes = [k for k, v in base.get('dados', {}).items() if abs(dados.get(k, 0) - v) > 0.1 * max(v, 1)]
+        if diferentes:
+            click.echo(f'Aviso: o banco difere da linha de base em {", ".join(diferentes)}; compare com cuidado.')
+    # Máquina mais lenta (ou mais carregada) que a da linha de base: escala a base
+    fator = calibracao / base['calibracao_ms'] if base.get('calibracao_ms') else 1.0
+    if abs(fator - 1) > 0.02:
+        click.echo(f'Calibração {calibracao} ms vs {base["calibracao_ms"]} ms da base: base ajustada por {fator:.2f}x')
+
+    regressoes = 0
+    for nome, medida in resultados.items():
+        anterior = base.get('rotas', {}).get(nome, {}).get('mediana_ms')
+        situacao = ''
+        if anterior is not None:
+            anterior = round(anterior * fator, 1)
+            variacao = (medida['mediana_ms'] - anterior) / anterior if anterior else 0
+            situacao = f'base {anterior:8.1f} ms ({variacao:+.0%})'
+            if variacao > tolerancia and medida['mediana_ms'] - anterior > BENCHMARK_RUIDO_MS:
+                situacao += '  REGRESSÃO'
+                regressoes += 1
+        click.echo(f'{nome:<36} {medida["mediana_ms"]:8.1f} ms (máx {medida["max_ms"]:8.1f})  {situacao}')
+
+    if salvar:
+        os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+        with open(arquivo, 'w', encoding='utf-8') as f:
+            json.dump({'gerado_em': datetime.now().isoformat(timespec='seconds'), 'dados': dados,
+                       'calibracao_ms': calibracao, 'rodadas': rodadas, 'rotas': resultados}, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        click.echo(f'Linha de base gravada em {arquivo}')
+    elif regressoes:
+        raise SystemExit(1)
@@ -0,0 +1,284 @@
+"""Teste de carga dos horários de pico (`flask teste-carga`).
+
+Sobe um gunicorn local contra o banco atual (de preferência um banco de
+`flask seed`) e solta usuários virtuais com roteiros por perfil: professores
+fazendo chamada no início da aula, alunos abrindo o painel e o admin
+faturando na virada do mês. Cada usuário tem sua sessão (cookies) e segue o
+roteiro em loop com pausas aleatórias até o fim do tempo.
+"""
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+
+from app import app, db, User, Turma, Matricula
+from ferramentas.benchmark import SENHA_DADOS_SINTETICOS, _mes_seguinte_data, _contagem_dados
+
+# Quantidade de usuários virtuais por perfil em cada cenário (as opções
+# --professores/--alunos/--admins sobrepõem)
+CENARIOS_CARGA = {
+    'aula': {'professor': 30, 'aluno': 60, 'admin': 0},       # 7h / 18h: chamadas + alunos
+    'virada_mes': {'professor': 5, 'aluno': 60, 'admin': 2},  # dia 1º: faturamento
+}
+CARGA_PORTA_PADRAO = 8077
+
+def _percentil(valores_ordenados, p):
+    """Percentil pelo método nearest-rank (valores já ordenados)."""
+    if not valores_ordenados:
+        return 0.0
+    posicao = max(int(-(-p * len(valores_ordenados) // 100)) - 1, 0)
+    return valores_ordenados[posicao]
+
+def _alvos_carga(quantidades):
+    """Usuários de cada perfil (e suas turmas) para os roteiros, do banco atual."""
+    turmas_por_professor = defaultdict(list)
+    for turma_id, professor_id in db.session.query(Turma.id, Turma.professor_id).filter(Turma.ativa == True) \
+            .join(Matricula, Matricula.turma_id == Turma.id).distinct():
+        turmas_por_professor[professor_id].append(turma_id)
+    alunos_por_turma = defaultdict(list)
+    for turma_id, user_id in db.session.query(Matricula.turma_id, Matricula.user_id):
+        alunos_por_turma[turma_id].append(user_id)
+    emails = dict(db.session.query(User.id, User.email).filter(User.id.in_(list(turmas_por_professor))))
+    professores = [{'email': emails[p], 'turmas': [(t, alunos_por_turma[t]) for t in turmas]}
+                   for p, turmas in sorted(turmas_por_professor.items())][:quantidades['professor']]
+    alunos = [email for (email,) in db.session.query(User.email).join(Matricula, Matricula.user_id == User.id)
+              .filter(User.role == 'aluno').distinct().order_by(User.email).limit(quantidades['aluno'])]
+    admin = User.query.filter_by(is_admin=True).first()
+    todos_alunos = [str(i) for (i,) in db.session.query(Matricula.user_id).distinct()]
+    return {'professor': professores, 'aluno': alunos, 'admin': admin and admin.email, 'alunos_ids': todos_alunos}
+
+class _UsuarioVirtual:
+    """Sessão HTTP de um usuário; cronometra cada request pelo nome da rota."""
+    def __init__(self, base, registrar, tempo_limite):
+        import http.cookiejar
+        import urllib.request
+
+        class SemRedirecionar(urllib.request.HTTPRedirectHandler):
+            # O redirect pós-POST é outro request; não entra na medida deste
+            def redirect_request(self, *args, **kwargs):
+                return None
+
+        self.base = base
+        self.registrar = registrar
+        self.tempo_limite = tempo_limite
+        self.abridor = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), SemRedirecionar)
+
+    def request(self, rota, caminho, dados=None):
+        import urllib.error
+        import urllib.parse
+        corpo = urllib.parse.urlencode(dados, doseq=True).encode() if dados is not None else None
+        inicio = time.perf_counter()
+        erro = None
+        try:
+            with self.abridor.open(self.base + caminho, data=corpo, timeout=self.tempo_limite) as resposta:
+                resposta.read()
+        except urllib.error.HTTPError as e:
+            # 3xx chega aqui porque não seguimos redirects
+            if e.code >= 400:
+                erro = f'HTTP {e.code}'
+            elif '/login' in e.headers.get('Location', ''):
+                erro = 'sessão perdida'
+        except Exception as e:  # timeout, conexão recusada/resetada
+            erro = type(e).__name__
+        else:
+            if rota == 'login' and dados is not None:
+                erro = 'login recusado'  # login aceito sempre redireciona
+        self.registrar(rota, (time.perf_counter() - inicio) * 1000, erro)
+        return erro is None
+
+    def entrar(self, email):
+        return self.request('login', '/login', {'email': email, 'password': SENHA_DADOS_SINTETICOS})
+
+def _roteiro_professor(usuario, alvo, pausar, ativo, rnd):
+    if not usuario.entrar(alvo['email']):
+        return
+    hoje = datetime.now().date().isoformat()
+    while ativo():
+        usuario.request('professor_dashboard', '/professor_dashboard')
+        pausar()
+        turma_id, alunos = rnd.choice(alvo['turmas'])
+        usuario.request('get_alunos_turma', f'/get_alunos_turma/{turma_id}')
+        pausar()
+        presentes = [str(a) for a in alunos if rnd.random() < 0.85]
+        usuario.request('salvar_chamada', f'/salvar_chamada/{turma_id}',
+                        {'datas': [hoje], 'alunos_presenca': presentes})
+        pausar()
+
+def _roteiro_aluno(usuario, email, pausar, ativo, rnd):
+    if not usuario.entrar(email):
+        return
+    while ativo():
+        usuario.request('aluno_dashboard', '/aluno_dashboard')
+        pausar()
+        usuario.request('horarios', '/horarios')
+        pausar()
+
+def _roteiro_admin(usuario, alvo, pausar, ativo, rnd, gravar):
+    if not usuario.entrar(alvo['admin']):
+        return
+    mes = _mes_seguinte_data(datetime.now().date().replace(day=1)).strftime('%Y-%m')
+    while ativo():
+        usuario.request('admin_dashboard', '/admin_dashboard')
+        pausar()
+        dados = {'alunos_ids': alvo['alunos_ids'], 'mes_referencia': mes,
+                 'valor': str(app.config['VALOR_MENSALIDADE_PADRAO'])}
+        if not gravar:
+            dados['dry_run'] = '1'
+        usuario.request('gerar_mensalidades_lote', '/gerar_mensalidades_lote', dados)
+        pausar()
+        usuario.request('relatorio_financeiro_professor', f'/relatorio_financeiro_professor?mes={mes}')
+        pausar()
+
+@contextmanager
+def _gunicorn_local(porta, workers, threads):
+    """Sobe o gunicorn do projeto (gunicorn.conf.py) no banco atual e espera o /login responder."""
+    import subprocess
+    import urllib.request
+    ambiente = dict(os.environ, SCHEDULER_ATIVO='0', GUNICORN_BIND=f'127.0.0.1:{porta}',
+                    GUNICORN_WORKERS=str(workers), GUNICORN_THREADS=str(threads),
+                    DATABASE_URL=app.config['SQLALCHEMY_DATABASE_URI'])
+    ambiente.pop('FLASK_RUN_FROM_CLI', None)
+    processo = subprocess.Popen(['gunicorn'], env=ambiente, cwd=app.root_path,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    base = f'http://127.0.0.1:{porta}'
+    try:
+        for _ in range(150):
+            if processo.poll() is not None:
+                raise click.ClickException(f'gunicorn saiu na partida:\n{processo.stderr.read()[-2000:]}')
+            try:
+                urllib.request.urlopen(base + '/login', timeout=2).read()
+                break
+            except OSError:
+                time.sleep(0.2)
+        else:
+            raise click.ClickException('gunicorn não respondeu em 30s.')
+        yield base
+    finally:
+        processo.terminate()
+        try:
+            processo.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            processo.kill()
+
+@click.command('teste-carga')
+@click.option('--cenario', type=click.Choice(sorted(CENARIOS_CARGA)), default='aula', show_default=True)
+@click.option('--professores', type=int, default=None, help='Professores simultâneos (padrão: do cenário).')
+@click.option('--alunos', type=int, default=None, help='Alunos simultâneos (padrão: do cenário).')
+@click.option('--admins', type=int, default=None, help='Admins simultâneos (padrão: do cenário).')
+@click.option('--duracao', default=60, show_default=True, help='Segundos de carga, sem contar a rampa.')
+@click.option('--rampa', default=10, show_default=True, help='Segundos para todos os usuários entrarem.')
+@click.option('--pausa', default=1.0, show_default=True, help='Pausa média (s) entre passos; 0 = sem pausa.')
+@click.option('--workers', default=3, show_default=True, help='Workers do gunicorn local.')
+@click.option('--threads', default=4, show_default=True, help='Threads por worker do gunicorn local.')
+@click.option('--porta', default=CARGA_PORTA_PADRAO, show_default=True)
+@click.option('--url', default=None, help='Usa um servidor já no ar em vez de subir o gunicorn local.')
+@click.option('--gravar', is_flag=True, help='Admin fatura de verdade (padrão: dry_run, não altera o banco).')
+@click.option('--tempo-limite', default=30.0, show_default=True, help='Timeout de cada request (s).')
+@click.option('--max-erros', default=0.01, show_default=True, help='Taxa de erro aceita; acima disso sai com 1.')
+@click.option('--saida', default=None, help='Grava o resultado em JSON neste arquivo.')
+@click.option('--semente', default=42, show_default=True)
+@with_appcontext
+def teste_carga_command(cenario, professores, alunos, admins, duracao, rampa, pausa, workers, threads, porta,
+                        url, gravar, tempo_limite, max_erros, saida, semente):
+    """Simula o pico (chamadas, painel dos alunos, faturamento) e mede p50/p95/p99 por rota."""
+    quantidades = dict(CENARIOS_CARGA[cenario])
+    for perfil, valor in (('professor', professores), ('aluno', alunos), ('admin', admins)):
+        if valor is not None:
+            quantidades[perfil] = valor
+    alvos = _alvos_carga(quantidades)
+    if quantidades['professor'] and not alvos['professor'] or quantidades['aluno'] and not alvos['aluno']:
+        raise click.ClickException('Banco sem turmas/matrículas: rode `flask seed` antes.')
+    if quantidades['admin'] and not alvos['admin']:
+        raise click.ClickException('Banco sem admin.')
+
+    tempos = defaultdict(list)
+    erros = defaultdict(lambda: defaultdict(int))
+    trava = threading.Lock()
+
+    def registrar(rota, ms, erro):
+        with trava:
+            tempos[rota].append(ms)
+            if erro:
+                erros[rota][erro] += 1
+
+    rnd_global = random.Random(semente)
+    tarefas = [('professor', alvo) for alvo in alvos['professor']]
+    tarefas += [('aluno', email) for email in alvos['aluno']]
+    tarefas += [('admin', alvos)] * quantidades['admin']
+    rnd_global.shuffle(tarefas)
+
+    def executar(base):
+        inicio = time.monotonic()
+        fim = inicio + rampa + duracao
+        ativo = lambda: time.monotonic() < fim
+
+        def usuario_virtual(indice, perfil, alvo):
+            rnd = random.Random(semente + indice)
+            # Entrada escalonada ao longo da rampa, como a turma chegando
+            time.sleep(rampa * indice / max(len(tarefas), 1))
+            pausar = lambda: pausa and time.sleep(rnd.uniform(0, 2 * pausa))
+            usuario = _UsuarioVirtual(base, registrar, tempo_limite)
+            if perfil == 'professor':
+                _roteiro_professor(usuario, alvo, pausar, ativo, rnd)
+            elif perfil == 'aluno':
+                _roteiro_aluno(usuario, alvo, pausar, ativo, rnd)
+            else:
+                _roteiro_admin(usuario, alvo, pausar, ativo, rnd, gravar)
+
+        linhas = [threading.Thread(target=usuario_virtual, args=(i, perfil, alvo), daemon=True)
+                  for i, (perfil, alvo) in enumerate(tarefas)]
+        for linha in linhas:
+            linha.start()
+        for linha in linhas:
+            linha.join()
+        return time.monotonic() - inicio
+
+    click.echo(f'Cenário {cenario}: {len(alvos["professor"])} professores, {len(alvos["aluno"])} alunos, '
+               f'{quantidades["admin"]} admins; {rampa}s de rampa + {duracao}s'
+               f'{"" if url else f" contra gunicorn local ({workers}x{threads})"}')
+    if url:
+        segundos = executar(url.rstrip('/'))
+    else:
+        with _gunicorn_local(porta, workers, threads) as base:
+            segundos = executar(base)
+
+    resultado = {}
+    total = total_erros = 0
+    click.echo(f'{"rota":<32} {"reqs":>7} {"erros":>7} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"máx ms":>9}')
+    for rota in sorted(tempos):
+        medidas = sorted(tempos[rota])
+        quantidade_erros = sum(erros[rota].values())
+        resultado[rota] = {
+            'requests': len(medidas), 'erros': quantidade_erros, 'taxa_erro': quantidade_erros / len(medidas),
+            'p50_ms': round(_percentil(medidas, 50), 1), 'p95_ms': round(_percentil(medidas, 95), 1),
+            'p99_ms': round(_percentil(medidas, 99), 1), 'max_ms': round(medidas[-1], 1),
+            'tipos_erro': dict(erros[rota]),
+        }
+        total += len(medidas)
+        total_erros += quantidade_erros
+        r = resultado[rota]
+        click.echo(f'{rota:<32} {r["requests"]:>7} {r["taxa_erro"]:>7.1%} {r["p50_ms"]:>9.1f} '
+                   f'{r["p95_ms"]:>9.1f} {r["p99_ms"]:>9.1f} {r["max_ms"]:>9.1f}')
+        for tipo, quantidade in sorted(erros[rota].items()):
+            click.echo(f'    {quantidade:>6}x {tipo}')
+    taxa_erro = total_erros / total if total else 0
+    click.echo(f'Total: {total} requests em {segundos:.0f}s ({total / segundos:.1f} req/s), {taxa_erro:.2%} de erros')
+
+    if saida:
+        with open(saida, 'w', encoding='utf-8') as f:
+            json.dump({'gerado_em': datetime.now().isoformat(timespec='seconds'), 'cenario': cenario,
+                       'usuarios': quantidades, 'duracao_s': round(segundos, 1), 'pausa_s': pausa,
+                       'servidor': url or f'gunicorn {workers}x{threads}', 'dados': _contagem_dados(),
+                       'rotas': resultado}, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        click.echo(f'Resultado gravado em {saida}')
+    if not total or taxa_erro > max_erros:
+        raise SystemExit(1)
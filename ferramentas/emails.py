@@ -0,0 +1,137 @@
+"""Verificação automática da fila de e-mails (`flask verificar-emails`).
+
+Sobe um SMTP de mentira em 127.0.0.1 e roda, num processo separado com um
+SQLite temporário, o mesmo caminho da produção: enfileirar_email ->
+drenar_fila_emails. Confere que o lote saiu por uma única conexão, que a
+recusa do servidor vira nova tentativa com backoff e que a trava do job foi
+liberada. Não toca no banco configurado nem em servidores reais.
+"""
+import json
+import os
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+
+import click
+from flask.cli import with_appcontext
+
+from app import app
+
+# Destinatários com este prefixo são recusados pelo SMTP de mentira (550)
+PREFIXO_RECUSADO = 'recusar'
+
+VERIFICACAO_SCRIPT = '''
+import json, os, sys
+sys.path.insert(0, os.getcwd())
+import app as modulo
+aplicacao = modulo.create_app()
+with aplicacao.app_context():
+    modulo.db.create_all()
+    for i in range(5):
+        modulo.enfileirar_email(f'Teste {i}', [f'aluno{i}@exemplo.com'], f'Corpo {i}')
+    modulo.enfileirar_email('Teste recusado', ['recusar@exemplo.com'], 'Corpo')
+    modulo.db.session.commit()
+    enviados = modulo.drenar_fila_emails()
+    emails = modulo.EmailSaida.query.order_by(modulo.EmailSaida.id).all()
+    trava = modulo.TravaJob.query.filter_by(nome='envio_emails').first()
+    print(json.dumps({
+        'enviados': enviados,
+        'status': [e.status for e in emails],
+        'tentativas': [e.tentativas for e in emails],
+        'com_backoff': [e.proxima_tentativa_em > e.criado_em for e in emails],
+        # A drenagem cria a linha ao tomar a trava; liberada = sem dono e já expirada
+        'trava_tomada': trava is not None,
+        'trava_livre': trava is not None and trava.dono is None
+                       and trava.expira_em <= modulo.datetime.utcnow(),
+    }))
+'''
+
+
+class _SmtpDeMentira(socketserver.StreamRequestHandler):
+    """Fala o mínimo de SMTP que o smtplib usa; guarda as mensagens aceitas."""
+
+    def responder(self, linha):
+        self.wfile.write(linha.encode() + b'\r\n')
+
+    def handle(self):
+        servidor = self.server
+        with servidor.trava:
+            servidor.conexoes += 1
+        self.responder('220 localhost')
+        destinatarios = []
+        while True:
+            linha = self.rfile.readline().decode(errors='replace').strip()
+            if not linha:
+                return
+            comando = linha.upper()
+            if comando.startswith(('EHLO', 'HELO')):
+                self.responder('250 localhost')
+            elif comando.startswith('MAIL FROM'):
+                destinatarios = []
+                self.responder('250 OK')
+            elif comando.startswith('RCPT TO'):
+                if PREFIXO_RECUSADO.upper() in comando:
+                    self.responder('550 destinatario recusado')
+                else:
+                    destinatarios.append(linha.split(':', 1)[1].strip(' <>'))
+                    self.responder('250 OK')
+            elif comando == 'DATA':
+                self.responder('354 fim com <CRLF>.<CRLF>')
+                while self.rfile.readline().rstrip(b'\r\n') != b'.':
+                    pass
+                with servidor.trava:
+                    servidor.mensagens.extend(destinatarios)
+                self.responder('250 OK')
+            elif comando == 'QUIT':
+                self.responder('221 tchau')
+                return
+            else:  # RSET, NOOP
+                self.responder('250 OK')
+
+
+class _ServidorSmtp(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SmtpDeMentira)
+        self.trava = threading.Lock()
+        self.conexoes = 0
+        self.mensagens = []
+
+
+@click.command('verificar-emails')
+@with_appcontext
+def verificar_emails_command():
+    """Drena uma fila de teste contra um SMTP local e falha se o envio se comportar mal."""
+    servidor = _ServidorSmtp()
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    pasta = tempfile.mkdtemp()
+    ambiente = dict(os.environ, SCHEDULER_ATIVO='0', DATABASE_URL=f'sqlite:///{os.path.join(pasta, "emails.db")}',
+                    MAIL_SERVER='127.0.0.1', MAIL_PORT=str(servidor.server_address[1]), MAIL_USE_TLS='0',
+                    EMAIL_USER='escola@exemplo.com', EMAIL_PASS='', EMAIL_INTERVALO_ENVIO='0')
+    ambiente.pop('FLASK_RUN_FROM_CLI', None)
+    try:
+        saida = subprocess.run([sys.executable, '-c', VERIFICACAO_SCRIPT], env=ambiente, cwd=app.root_path,
+                               capture_output=True, text=True)
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+    if saida.returncode:
+        raise click.ClickException(f'O envio de teste falhou:\n{saida.stderr[-2000:]}')
+    resultado = json.loads(saida.stdout.strip().splitlines()[-1])
+
+    verificacoes = [
+        ('5 mensagens aceitas pelo SMTP', sorted(servidor.mensagens) == [f'aluno{i}@exemplo.com' for i in range(5)]),
+        ('uma única conexão para o lote', servidor.conexoes == 1),
+        ('5 marcadas como enviadas', resultado['enviados'] == 5 and resultado['status'][:5] == ['enviado'] * 5),
+        ('recusa vira nova tentativa com backoff', resultado['status'][5] == 'pendente'
+         and resultado['tentativas'][5] == 1 and resultado['com_backoff'][5]),
+        ('trava envio_emails tomada pela drenagem', resultado['trava_tomada']),
+        ('trava envio_emails liberada', resultado['trava_livre']),
+    ]
+    for descricao, ok in verificacoes:
+        click.echo(f'{"ok    " if ok else "FALHOU"} {descricao}')
+    if not all(ok for _, ok in verificacoes):
+        raise SystemExit(1)
@@ -0,0 +1,167 @@
+"""Verificação dos planos de consulta das rotas quentes (`flask verificar-planos`).
+
+Roda as rotas mais acessadas pelo test client, captura os SELECTs e passa
+cada um por EXPLAIN: falha se alguma tabela que cresce com o histórico for
+lida por inteiro.
+"""
+import re
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import event, inspect
+
+from app import (app, db, User, Turma, Matricula, Mensalidade, Presenca, ContasPagar, criar_indice_busca,
+                 _hash_no_processo)
+
+# Tabelas que crescem com o histórico da escola: não podem ser lidas por inteiro
+TABELAS_VERIFICADAS = {'user', 'mensalidade', 'presenca', 'matricula', 'contas_pagar',
+                       'historico_matricula', 'email_saida'}
+
+def _rotas_quentes(admin, professor, aluno, turma_id, mes):
+    return [
+        (admin, '/admin_dashboard'),
+        (admin, f'/admin_dashboard?status=Pendente&mes={mes}&turma_id={turma_id}&professor_id={professor}'),
+        (admin, f'/admin_dashboard?mes={mes}&mes_fim={mes}'),
+        (admin, f'/relatorio_financeiro_professor?mes={mes}'),
+        (admin, f'/relatorio_financeiro_professor/{professor}/alunos?mes={mes}'),
+        (professor, '/professor_dashboard'),
+        (professor, f'/get_alunos_turma/{turma_id}'),
+        (professor, '/buscar_alunos?q=al'),
+        (professor, f'/historico_presenca/{aluno}'),
+        (aluno, '/aluno_dashboard'),
+    ]
+
+def _tabela_base(nome):
+    # 'mensalidade_1' (alias do SQLAlchemy) -> 'mensalidade'
+    return re.sub(r'_\d+$', '', nome)
+
+# Buscas por chave única leem uma linha por linha da tabela externa: não contam
+_BUSCA_UNICA = re.compile(r'USING (INTEGER PRIMARY KEY|PRIMARY KEY|(COVERING )?INDEX sqlite_autoindex_)')
+
+def leituras_completas(conn, instrucao, parametros):
+    """Roda EXPLAIN na instrução e devolve as leituras completas de tabelas verificadas.
+
+    Conta como leitura completa:
+    - o SCAN da tabela (ou do índice inteiro);
+    - a busca por índice não único (SEARCH/ref) repetida para cada linha de
+      uma tabela varrida por inteiro antes dela no plano: o prefixo da busca
+      vem da junção e não filtra nada, então o índice é lido de ponta a ponta
+      (ex.: SCAN turma + SEARCH mensalidade (turma_id=?) num GROUP BY).
+    Com LIMIT e sem ordenação em memória (paginação por cursor) nada disso
+    conta, pois a leitura para na primeira página.
+    """
+    com_limite = 'LIMIT' in instrucao.upper()
+    problemas = []
+    if conn.dialect.name == 'mysql':
+        linhas = list(conn.exec_driver_sql('EXPLAIN ' + instrucao, parametros).mappings())
+        ordena_em_memoria = any('filesort' in (linha.get('Extra') or '') for linha in linhas)
+        if com_limite and not ordena_em_memoria:
+            return problemas
+        varreu = False
+        for linha in linhas:
+            tabela = _tabela_base(linha.get('table') or '')
+            tipo = linha.get('type')
+            juncao = '.' in (linha.get('ref') or '')  # 'banco.turma.id' e não 'const'
+            if tabela in TABELAS_VERIFICADAS:
+                if tipo in ('ALL', 'index'):
+                    problemas.append(f"{tabela}: type={tipo} {linha.get('Extra') or ''}")
+                elif tipo in ('ref', 'ref_or_null') and juncao and varreu:
+                    problemas.append(f"{tabela}: type={tipo} ref={linha.get('ref')} para cada linha de uma varredura")
+            varreu = varreu or tipo in ('ALL', 'index')
+    else:
+        detalhes = [linha[3] for linha in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + instrucao, parametros)]
+        ordena_em_memoria = any('TEMP B-TREE FOR ORDER BY' in d for d in detalhes)
+        if com_limite and not ordena_em_memoria:
+            return problemas
+        varreu = False
+        for detalhe in detalhes:
+            leitura = re.match(r'(SCAN|SEARCH) (\w+)', detalhe)
+            if not leitura or leitura.group(2) == 'CONSTANT':
+                continue
+            tabela = _tabela_base(leitura.group(2))
+            if tabela in TABELAS_VERIFICADAS:
+                if leitura.group(1) == 'SCAN':
+                    problemas.append(detalhe)
+                elif varreu and not _BUSCA_UNICA.search(detalhe):
+                    problemas.append(f'{detalhe} (para cada linha de uma varredura)')
+            varreu = varreu or leitura.group(1) == 'SCAN'
+    return problemas
+
+def _preparar_dados_planos():
+    db.create_all()
+    criar_indice_busca()
+    senha = _hash_no_processo('verificar-planos', 4)
+    admin = User(username='Admin Planos', email='admin@planos', password=senha, role='professor', is_admin=True, is_approved=True)
+    professor = User(username='Professor Planos', email='prof@planos', password=senha, role='professor', is_approved=True)
+    db.session.add_all([admin, professor])
+    db.session.flush()
+    turma = Turma(nome='Turma Planos', professor_id=professor.id)
+    db.session.add(turma)
+    db.session.flush()
+    hoje = datetime.now().date()
+    for i in range(3):
+        aluno = User(username=f'aluno planos {i}', email=f'aluno{i}@planos', password=senha, role='aluno', is_approved=True)
+        db.session.add(aluno)
+        db.session.flush()
+        db.session.add(Matricula(user_id=aluno.id, turma_id=turma.id, data_vencimento=10))
+        db.session.add(Mensalidade(aluno_id=aluno.id, turma_id=turma.id, professor_id=professor.id,
+                                   mes=hoje.strftime('%Y-%m'), valor=100.0, data_matricula=hoje))
+        db.session.add(Presenca(user_id=aluno.id, turma_id=turma.id, data_aula=hoje, presente=True))
+    db.session.add(ContasPagar(descricao='Conta Planos', valor=50.0, vencimento=hoje))
+    db.session.commit()
+
+@click.command('verificar-planos')
+@click.option('--preparar', is_flag=True, help='Cria tabelas e dados mínimos (só em banco vazio).')
+@with_appcontext
+def verificar_planos_command(preparar):
+    """Captura as consultas das rotas quentes e falha se alguma ler uma tabela inteira."""
+    if preparar:
+        if inspect(db.engine).has_table('user') and User.query.first():
+            raise click.ClickException('--preparar só pode ser usado em um banco vazio.')
+        _preparar_dados_planos()
+
+    admin = User.query.filter_by(is_admin=True).first()
+    turma = Turma.query.first()
+    aluno = User.query.filter_by(role='aluno').first()
+    if not (admin and turma and aluno):
+        raise click.ClickException('É preciso ao menos um admin, uma turma e um aluno (use --preparar em um banco vazio).')
+    rotas = _rotas_quentes(admin.id, turma.professor_id, aluno.id, turma.id, datetime.now().strftime('%Y-%m'))
+
+    capturadas = []
+    def capturar(conn, cursor, instrucao, parametros, contexto, executemany):
+        if instrucao.lstrip().upper().startswith('SELECT'):
+            capturadas.append((instrucao, parametros))
+
+    falhas = 0
+    cliente = app.test_client()
+    event.listen(db.engine, 'before_cursor_execute', capturar)
+    try:
+        for usuario_id, url in rotas:
+            with cliente.session_transaction() as sessao:
+                sessao['_user_id'] = str(usuario_id)
+                sessao['_fresh'] = True
+            capturadas.clear()
+            # Contexto novo por request: o `g` do comando guardaria o usuário do request anterior
+            with app.app_context():
+                resposta = cliente.get(url)
+            consultas = list(capturadas)
+
+            problemas = []
+            with db.engine.connect() as conn:
+                for instrucao, parametros in consultas:
+                    for problema in leituras_completas(conn, instrucao, parametros):
+                        problemas.append((problema, instrucao))
+
+            if resposta.status_code != 200 or problemas:
+                falhas += 1
+                click.echo(f'FALHOU {url} (HTTP {resposta.status_code}, {len(consultas)} consultas)')
+                for problema, instrucao in problemas:
+                    click.echo(f'    {problema}\n        {" ".join(instrucao.split())[:200]}')
+            else:
+                click.echo(f'ok     {url} ({len(consultas)} consultas)')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capturar)
+
+    if falhas:
+        raise SystemExit(1)
@@ -0,0 +1,66 @@
+# Configuração do gunicorn (lida automaticamente a partir do diretório do app).
+#
+# Perfis, escolhidos por variável de ambiente:
+#   GUNICORN_WORKERS   processos (padrão 3)
+#   GUNICORN_THREADS   threads por processo; > 1 usa o worker gthread (padrão 4)
+#   GUNICORN_PRELOAD   1 = importa o app uma vez no master e faz fork (padrão 1)
+#
+# Com preload, o master carrega app e templates, congela os objetos (gc.freeze)
+# e os workers herdam essas páginas de memória compartilhadas (copy-on-write).
+# Cada worker descarta o pool de conexões herdado, zera a medição da primeira
+# resposta (worker_primeira_resposta_segundos), sobe o pool de bcrypt (se
+# BCRYPT_PROCESSOS) enquanto ainda tem uma só thread e só então inicia o agendador.
+#
+# Métricas: os workers gravam em PROMETHEUS_MULTIPROC_DIR (limpo a cada start)
+# e o /metrics soma todos; a variável precisa existir antes do import do app.
+import gc
+import glob
+import os
+
+_pasta_metricas = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/metricas_gunicorn')
+os.makedirs(_pasta_metricas, exist_ok=True)
+for _arquivo in glob.glob(os.path.join(_pasta_metricas, "*.db")):
+    os.remove(_arquivo)
+
+wsgi_app = 'app:create_app()'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '3'))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+worker_class = 'gthread' if threads > 1 else 'sync'
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+
+
+def when_ready(server):
+    # No master, depois do preload e antes do primeiro fork
+    if preload_app:
+        import app as modulo
+        modulo.aquecer_worker()
+        # O master não atende: seus gauges 'live*' (zerados) não entram no /metrics
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(os.getpid())
+        # O que existe agora vai para a geração permanente: o GC dos workers
+        # não percorre (nem suja) essas páginas
+        gc.collect()
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    import app as modulo
+    if preload_app:
+        modulo.reiniciar_apos_fork()
+    # Ainda com uma única thread: o pool de bcrypt (se ligado) pode usar fork
+    modulo.iniciar_pool_hash()
+
+
+def child_exit(server, worker):
+    # Gauges 'livesum' deixam de contar o worker que morreu
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    import app as modulo
+    if not preload_app:
+        modulo.aquecer_worker()
+    modulo.iniciar_agendador()
@@ -0,0 +1,43 @@
+"""Índices compostos das consultas quentes
+
+Revision ID: 0b9d6e3f4a21
+Revises: f5c3d8a2e147
+Create Date: 2026-10-18 15:10:44.682051
+
+Verifique os planos com `flask verificar-planos` depois de aplicar.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b9d6e3f4a21'
+down_revision = 'f5c3d8a2e147'
+branch_labels = None
+depends_on = None
+
+
+INDICES = [
+    ('user', 'ix_user_role', ['role']),
+    ('turma', 'ix_turma_professor_id', ['professor_id']),
+    ('contas_pagar', 'ix_contas_pagar_status_vencimento', ['status', 'vencimento']),
+    ('mensalidade', 'ix_mensalidade_turma_status', ['turma_id', 'status']),
+    ('mensalidade', 'ix_mensalidade_professor_mes', ['professor_id', 'mes']),
+    ('mensalidade', 'ix_mensalidade_mes_status', ['mes', 'status']),
+    ('presenca', 'ix_presenca_turma_data', ['turma_id', 'data_aula']),
+    ('presenca', 'ix_presenca_user_data', ['user_id', 'data_aula']),
+    ('matricula', 'ix_matricula_turma_user', ['turma_id', 'user_id']),
+    ('matricula', 'ix_matricula_user_turma', ['user_id', 'turma_id']),
+]
+
+
+def upgrade():
+    for tabela, nome, colunas in INDICES:
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            batch_op.create_index(nome, colunas, unique=False)
+
+
+def downgrade():
+    for tabela, nome, colunas in reversed(INDICES):
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            batch_op.drop_index(nome)
@@ -0,0 +1,42 @@
+"""Adicionar tabela resumo_financeiro
+
+Revision ID: 3a7c91d2e5b4
+Revises: fa15b9aacbce
+Create Date: 2026-10-18 09:12:40.118230
+
+Depois de aplicar, rode `flask reconstruir-resumo` para popular a tabela
+com as mensalidades e contas já existentes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a7c91d2e5b4'
+down_revision = 'fa15b9aacbce'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('resumo_financeiro',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tipo', sa.String(length=20), nullable=False),
+    sa.Column('mes', sa.String(length=7), nullable=False),
+    sa.Column('turma_id', sa.Integer(), nullable=False),
+    sa.Column('professor_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.Column('valor_total', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('tipo', 'mes', 'turma_id', 'professor_id', 'status', name='uq_resumo_financeiro_chave')
+    )
+    with op.batch_alter_table('resumo_financeiro', schema=None) as batch_op:
+        batch_op.create_index('ix_resumo_financeiro_tipo_status_mes', ['tipo', 'status', 'mes'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('resumo_financeiro', schema=None) as batch_op:
+        batch_op.drop_index('ix_resumo_financeiro_tipo_status_mes')
+
+    op.drop_table('resumo_financeiro')
@@ -0,0 +1,32 @@
+"""Coluna competencia (date) em mensalidade
+
+Revision ID: 7c4e1a9b3d58
+Revises: 0b9d6e3f4a21
+Create Date: 2026-10-18 16:02:17.318440
+
+A coluna entra nula para não reescrever a tabela; as linhas existentes são
+preenchidas em lotes pela revisão seguinte (a3d9f1c6b820).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c4e1a9b3d58'
+down_revision = '0b9d6e3f4a21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('mensalidade', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('competencia', sa.Date(), nullable=True))
+        batch_op.create_index('ix_mensalidade_competencia_status', ['competencia', 'status'], unique=False)
+        batch_op.create_index('ix_mensalidade_aluno_competencia', ['aluno_id', 'competencia'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('mensalidade', schema=None) as batch_op:
+        batch_op.drop_index('ix_mensalidade_aluno_competencia')
+        batch_op.drop_index('ix_mensalidade_competencia_status')
+        batch_op.drop_column('competencia')
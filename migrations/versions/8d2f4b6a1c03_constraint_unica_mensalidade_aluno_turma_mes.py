@@ -0,0 +1,38 @@
+"""Constraint única em mensalidade (aluno_id, turma_id, mes)
+
+Revision ID: 8d2f4b6a1c03
+Revises: 3a7c91d2e5b4
+Create Date: 2026-10-18 10:02:11.407512
+
+Remove duplicatas antigas antes de criar a constraint. Em cada grupo fica a
+mensalidade paga (se houver), senão a de menor id: apagar a linha 'Pago' e
+manter a 'Pendente' perderia o registro do pagamento.
+Depois de aplicar, rode `flask reconstruir-resumo`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2f4b6a1c03'
+down_revision = '3a7c91d2e5b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        'DELETE FROM mensalidade WHERE id NOT IN ('
+        ' SELECT id_mantido FROM ('
+        "  SELECT COALESCE(MIN(CASE WHEN status = 'Pago' THEN id END), MIN(id)) AS id_mantido"
+        '  FROM mensalidade GROUP BY aluno_id, turma_id, mes'
+        ' ) AS mantidas'
+        ')'
+    )
+    with op.batch_alter_table('mensalidade', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_mensalidade_aluno_turma_mes', ['aluno_id', 'turma_id', 'mes'])
+
+
+def downgrade():
+    with op.batch_alter_table('mensalidade', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_mensalidade_aluno_turma_mes', type_='unique')
@@ -0,0 +1,67 @@
+"""Preenche mensalidade.competencia a partir de mes
+
+Revision ID: a3d9f1c6b820
+Revises: 7c4e1a9b3d58
+Create Date: 2026-10-18 18:41:05.226913
+
+Os filtros por período leem `competencia`; sem este preenchimento as
+mensalidades anteriores à coluna sumiriam dos relatórios e exportações.
+Atualiza em lotes por chave primária, como `flask preencher-competencia`
+(que continua servindo para repetir o preenchimento). Linhas com `mes`
+inválido ficam nulas.
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d9f1c6b820'
+down_revision = '7c4e1a9b3d58'
+branch_labels = None
+depends_on = None
+
+LOTE = 1000
+
+mensalidade = sa.table(
+    'mensalidade',
+    sa.column('id', sa.Integer),
+    sa.column('mes', sa.String),
+    sa.column('competencia', sa.Date),
+)
+
+
+def _competencia(mes):
+    try:
+        return datetime.strptime(mes, '%Y-%m').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def upgrade():
+    conexao = op.get_bind()
+    atualizar = (
+        mensalidade.update()
+        .where(mensalidade.c.id == sa.bindparam('id_'))
+        .values(competencia=sa.bindparam('competencia'))
+    )
+    ultimo_id = 0
+    while True:
+        linhas = conexao.execute(
+            sa.select(mensalidade.c.id, mensalidade.c.mes)
+            .where(mensalidade.c.competencia.is_(None), mensalidade.c.id > ultimo_id)
+            .order_by(mensalidade.c.id).limit(LOTE)
+        ).all()
+        if not linhas:
+            break
+        ultimo_id = linhas[-1].id
+        valores = [{'id_': l.id, 'competencia': _competencia(l.mes)} for l in linhas]
+        valores = [v for v in valores if v['competencia']]
+        if valores:
+            conexao.execute(atualizar, valores)
+
+
+def downgrade():
+    # A coluna continua existindo; só o preenchimento é desfeito com ela (7c4e1a9b3d58)
+    pass
@@ -0,0 +1,45 @@
+"""Adicionar tabelas trava_job e execucao_job
+
+Revision ID: b6e0c3f7a912
+Revises: 8d2f4b6a1c03
+Create Date: 2026-10-18 11:20:37.552904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e0c3f7a912'
+down_revision = '8d2f4b6a1c03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('trava_job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nome', sa.String(length=50), nullable=False),
+    sa.Column('dono', sa.String(length=150), nullable=True),
+    sa.Column('expira_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('nome')
+    )
+    op.create_table('execucao_job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nome', sa.String(length=50), nullable=False),
+    sa.Column('referencia', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('checkpoint', sa.Integer(), nullable=False),
+    sa.Column('processados', sa.Integer(), nullable=False),
+    sa.Column('iniciado_em', sa.DateTime(), nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+    sa.Column('concluido_em', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('nome', 'referencia', name='uq_execucao_job_nome_referencia')
+    )
+
+
+def downgrade():
+    op.drop_table('execucao_job')
+    op.drop_table('trava_job')
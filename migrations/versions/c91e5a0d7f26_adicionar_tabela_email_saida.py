@@ -0,0 +1,41 @@
+"""Adicionar tabela email_saida
+
+Revision ID: c91e5a0d7f26
+Revises: b6e0c3f7a912
+Create Date: 2026-10-18 12:05:49.230118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c91e5a0d7f26'
+down_revision = 'b6e0c3f7a912'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('email_saida',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('destinatarios', sa.Text(), nullable=False),
+    sa.Column('assunto', sa.String(length=255), nullable=False),
+    sa.Column('corpo', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('tentativas', sa.Integer(), nullable=False),
+    sa.Column('proxima_tentativa_em', sa.DateTime(), nullable=False),
+    sa.Column('ultimo_erro', sa.Text(), nullable=True),
+    sa.Column('criado_em', sa.DateTime(), nullable=False),
+    sa.Column('enviado_em', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('email_saida', schema=None) as batch_op:
+        batch_op.create_index('ix_email_saida_status_proxima', ['status', 'proxima_tentativa_em'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('email_saida', schema=None) as batch_op:
+        batch_op.drop_index('ix_email_saida_status_proxima')
+
+    op.drop_table('email_saida')
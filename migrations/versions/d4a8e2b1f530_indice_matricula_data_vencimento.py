@@ -0,0 +1,26 @@
+"""Índice em matricula.data_vencimento
+
+Revision ID: d4a8e2b1f530
+Revises: c91e5a0d7f26
+Create Date: 2026-10-18 12:48:03.771940
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8e2b1f530'
+down_revision = 'c91e5a0d7f26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('matricula', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_matricula_data_vencimento'), ['data_vencimento'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('matricula', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_matricula_data_vencimento'))
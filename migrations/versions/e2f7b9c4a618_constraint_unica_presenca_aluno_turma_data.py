@@ -0,0 +1,34 @@
+"""Constraint única em presenca (user_id, turma_id, data_aula)
+
+Revision ID: e2f7b9c4a618
+Revises: d4a8e2b1f530
+Create Date: 2026-10-18 13:31:26.904417
+
+Remove chamadas duplicadas (mantém a mais recente) antes de criar a constraint.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2f7b9c4a618'
+down_revision = 'd4a8e2b1f530'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        'DELETE FROM presenca WHERE id NOT IN ('
+        ' SELECT id_mantido FROM ('
+        '  SELECT MAX(id) AS id_mantido FROM presenca GROUP BY user_id, turma_id, data_aula'
+        ' ) AS mantidas'
+        ')'
+    )
+    with op.batch_alter_table('presenca', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_presenca_aluno_turma_data', ['user_id', 'turma_id', 'data_aula'])
+
+
+def downgrade():
+    with op.batch_alter_table('presenca', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_presenca_aluno_turma_data', type_='unique')
@@ -0,0 +1,63 @@
+"""Índice textual para busca de alunos
+
+Revision ID: f5c3d8a2e147
+Revises: e2f7b9c4a618
+Create Date: 2026-10-18 14:22:58.016384
+
+MySQL: índice FULLTEXT em user (username, email, cidade, contato_1).
+SQLite: tabela FTS5 user_busca sincronizada por triggers.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5c3d8a2e147'
+down_revision = 'e2f7b9c4a618'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS user_busca USING fts5("
+    "username, email, cidade, contato_1, content='user', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS user_busca_ai AFTER INSERT ON user BEGIN "
+    "INSERT INTO user_busca(rowid, username, email, cidade, contato_1) "
+    "VALUES (new.id, new.username, new.email, new.cidade, new.contato_1); END",
+    "CREATE TRIGGER IF NOT EXISTS user_busca_ad AFTER DELETE ON user BEGIN "
+    "INSERT INTO user_busca(user_busca, rowid, username, email, cidade, contato_1) "
+    "VALUES ('delete', old.id, old.username, old.email, old.cidade, old.contato_1); END",
+    "CREATE TRIGGER IF NOT EXISTS user_busca_au AFTER UPDATE ON user BEGIN "
+    "INSERT INTO user_busca(user_busca, rowid, username, email, cidade, contato_1) "
+    "VALUES ('delete', old.id, old.username, old.email, old.cidade, old.contato_1); "
+    "INSERT INTO user_busca(rowid, username, email, cidade, contato_1) "
+    "VALUES (new.id, new.username, new.email, new.cidade, new.contato_1); END",
+    "INSERT INTO user_busca(user_busca) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS user_busca_au",
+    "DROP TRIGGER IF EXISTS user_busca_ad",
+    "DROP TRIGGER IF EXISTS user_busca_ai",
+    "DROP TABLE IF EXISTS user_busca",
+]
+
+
+def upgrade():
+    dialeto = op.get_bind().dialect.name
+    if dialeto == 'mysql':
+        op.create_index('ft_user_busca', 'user', ['username', 'email', 'cidade', 'contato_1'],
+                        unique=False, mysql_prefix='FULLTEXT')
+    elif dialeto == 'sqlite':
+        for comando in SQLITE_UPGRADE:
+            op.execute(comando)
+
+
+def downgrade():
+    dialeto = op.get_bind().dialect.name
+    if dialeto == 'mysql':
+        op.drop_index('ft_user_busca', table_name='user')
+    elif dialeto == 'sqlite':
+        for comando in SQLITE_DOWNGRADE:
+            op.execute(comando)